@@ -1 +1,16 @@
- 
\ No newline at end of file
+from importlib import import_module
+
+# Public names resolved on first access (PEP 562), so importing the package
+# does not pull in pydantic, yaml or rich until they are actually needed.
+_LAZY = {
+    "AppCfg": ".config",
+    "load_config": ".config",
+    "Pipeline": ".pipeline",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name: str):
+    if name in _LAZY:
+        return getattr(import_module(_LAZY[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
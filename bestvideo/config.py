@@ -1,8 +1,14 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import List
 from pydantic import BaseModel, Field
 import yaml
 
+try:  # LibYAML bindings are several times faster when available
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 class ModuleCfg(BaseModel):
     name: str                  # dotted path to module class
     params: dict = Field(default_factory=dict)
@@ -12,7 +18,14 @@ class AppCfg(BaseModel):
     db: Path
     modules: List[ModuleCfg]
 
+@lru_cache(maxsize=32)
+def _load(path: str, mtime_ns: int) -> AppCfg:
+    # mtime_ns is part of the cache key only: an edited file is re-parsed
+    with open(path, "r", encoding="utf-8") as fh:
+        data = yaml.load(fh, Loader=_Loader)
+    return AppCfg.model_validate(data)
+
 def load_config(path: Path) -> AppCfg:
-    with path.open("r", encoding="utf-8") as fh:
-        data = yaml.safe_load(fh)
-    return AppCfg.model_validate(data) 
\ No newline at end of file
+    path = path.resolve()
+    # each caller gets its own copy: modules keep and may mutate their params
+    return _load(str(path), path.stat().st_mtime_ns).model_copy(deep=True)
\ No newline at end of file
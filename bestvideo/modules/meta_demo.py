@@ -1,11 +1,21 @@
+import logging
+import os
 from ..base_module import BaseModule
 from ..context import Context
 
+log = logging.getLogger(__name__)
+
 class MetaDemo(BaseModule):
     """Pretend to extract metadata."""
 
     def run(self, ctx: Context) -> None:
         files = ctx.pull("scan.files", [])
-        fake_meta = {str(f): {"duration": 0, "codec": "demo"} for f in files}
+        # column layout: one list per field, index-aligned with "paths"
+        paths = [os.fspath(f) for f in files]
+        fake_meta = {
+            "paths": paths,
+            "duration": [0] * len(paths),
+            "codec": ["demo"] * len(paths),
+        }
         ctx.push("meta.info", fake_meta)
-        print(f"MetaDemo processed: {fake_meta}") 
\ No newline at end of file
+        log.debug("MetaDemo processed %d files", len(paths))
\ No newline at end of file
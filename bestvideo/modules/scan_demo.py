@@ -1,23 +1,34 @@
+import logging
 from pathlib import Path
 from tqdm import tqdm
 from ..base_module import BaseModule
 from ..context import Context
 
+log = logging.getLogger(__name__)
+
 class ScanDemo(BaseModule):
-    """Dummy scan – collects *.mp4 files."""
+    """Dummy scan – collects *.mp4 files.
+
+    Params:
+        seed_demo: create a few dummy .mp4 files when `root` is empty.
+    """
 
     def run(self, ctx: Context) -> None:
         root = Path(ctx.cfg.root)
-        # Create dummy files for the demo if the root directory is empty or does not exist
-        if not root.exists() or not any(root.iterdir()):
-            root.mkdir(parents=True, exist_ok=True)
-            for i in range(5):
-                with open(root / f"video{i}.mp4", "w") as f:
-                    f.write("dummy mp4 content")
-            print(f"Created dummy .mp4 files in {root}")
+        if self.params.get("seed_demo"):
+            self._seed(root)
 
-        files = [p for p in root.rglob("*.mp4")]
-        for _ in tqdm(files, desc="Scanning"):
-            pass  # demo: no work
+        # progress ticks while rglob streams, instead of after a full listing
+        files = list(tqdm(root.rglob("*.mp4"), desc="Scanning"))
         ctx.push("scan.files", files)
-        print(f"ScanDemo found: {files}") 
\ No newline at end of file
+        log.info("ScanDemo found %d mp4 files", len(files))
+
+    @staticmethod
+    def _seed(root: Path) -> None:
+        if root.exists() and any(root.iterdir()):
+            return
+        root.mkdir(parents=True, exist_ok=True)
+        for i in range(5):
+            with open(root / f"video{i}.mp4", "w") as f:
+                f.write("dummy mp4 content")
+        log.info("Created dummy .mp4 files in %s", root)
\ No newline at end of file
@@ -1,13 +1,23 @@
+import logging
 import typer
 from pathlib import Path
-from bestvideo.config import load_config
-from bestvideo.pipeline import Pipeline
 
 app = typer.Typer()
 
 @app.command()
 def run(config: Path = typer.Option("example.yaml", help="Path to the configuration file.")):
     """Run BestVideo pipeline."""
+    # imported here so `--help` does not pay for pydantic, yaml and rich
+    from rich.logging import RichHandler
+    from bestvideo.config import load_config
+    from bestvideo.pipeline import Pipeline, console
+
+    # module log lines go through the pipeline's console
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(message)s",
+        handlers=[RichHandler(console=console, show_time=False, show_path=False)],
+    )
     cfg = load_config(config)
     Pipeline(cfg).run()
 
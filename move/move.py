@@ -8,9 +8,10 @@ safe_move.py — v 9.5
 """
 
 from __future__ import annotations
-import argparse, hashlib, itertools, logging, os, shutil, signal, sqlite3, sys
+import argparse, errno, fcntl, hashlib, logging, os, queue, signal, sqlite3, stat, sys, threading
 from pathlib import Path
-from typing import Generator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Generator, Iterable
 from time import monotonic
 import shutil as _shutil
 
@@ -21,14 +22,26 @@ except ImportError:
 
 # ────────────────  Config  ────────────────
 DB, LOGFILE     = "copy_progress.db", "safe_move.log"
-CHUNK           = 1 << 20          # 1 MiB
+HASHES          = ("sha256", "blake3", "xxh3")   # integrity check; see new_hasher
+HASH_ALGO       = "sha256"         # set from --hash
+CHUNK           = 8 << 20          # 8 MiB
+KCHUNK          = 16 << 20         # per in-kernel copy call
+READ_AHEAD      = 4                # chunks buffered by the reader thread
 TEMP_SFX        = ".part"
 SAFETY_FREE     = 5 << 30          # ≥ 5 GiB free
+COMMIT_EVERY    = 16               # journal marks per transaction …
+COMMIT_SECS     = 2.0              # … or older than this; also caps a settle batch's age
+SETTLE_EVERY    = 64               # moved files per directory-fsync batch …
+SETTLE_BYTES    = 1 << 30          # … or moved bytes, whichever first
+DIR_FDS         = 64               # target dir fds kept open between batches
+JOBS            = min(4, os.cpu_count() or 1)   # parallel file copies
 COLS            = _shutil.get_terminal_size(fallback=(120, 20)).columns
 BAR_NCOLS       = min(100, COLS)
-SPIN            = itertools.cycle("⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏")
+SPIN            = "⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏"     # spinner frames
 ESC_CLEAR       = "\x1b[K"
 LABEL_PAD       = "       "        # 7 spaces
+FILE_LABEL      = "Current file:" + LABEL_PAD
+NAME_ROOM       = COLS - len(FILE_LABEL) - 1   # room left for the file name
 
 # ─────────── Pretty helpers ───────────
 def fmt_size(b: int) -> str:
@@ -63,94 +76,482 @@ def shorten(txt: str, avail: int) -> str:
     keep = (avail - 3) // 2
     return txt[:keep] + "..." + txt[-keep:]
 
-def sha256sum(p: Path) -> str:
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for blk in iter(lambda: f.read(CHUNK), b""):
-            h.update(blk)
-    return h.hexdigest()
-
-def _with_stem(p: Path, stem: str) -> Path:
+def fadvise(fd: int, advice: str):
+    """posix_fadvise over the whole file, where the platform has it."""
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, getattr(os, "POSIX_FADV_" + advice))
+
+def new_hasher(algo: str):
+    """Fresh hasher for *algo*; blake3 / xxhash are imported only when chosen.
+
+    The check only guards against copy errors on this machine, not an
+    adversary, so a fast non-cryptographic hash is a valid choice.
+    """
+    if algo == "blake3":
+        from blake3 import blake3          # SIMD + multithreaded tree hash
+        return blake3(max_threads=blake3.AUTO)
+    if algo == "xxh3":
+        import xxhash
+        return xxhash.xxh3_128()
+    return hashlib.sha256()
+
+def file_hash(p: Path) -> str:
+    # unbuffered fd: file_digest() (3.11+) drives the read loop in C and
+    # hands whole blocks to the hasher (OpenSSL uses SHA-NI where available)
+    with p.open("rb", buffering=0) as f:
+        fadvise(f.fileno(), "SEQUENTIAL")
+        if hasattr(hashlib, "file_digest"):
+            algo = HASH_ALGO
+            h = hashlib.file_digest(f, "sha256" if algo == "sha256" else lambda: new_hasher(algo))
+        else:
+            h = new_hasher(HASH_ALGO)     # 3.10: same loop, one reused buffer
+            buf = memoryview(bytearray(CHUNK))
+            while n := f.readinto(buf):
+                h.update(buf[:n])
+        fadvise(f.fileno(), "DONTNEED")   # read once; don't evict hotter pages
+        return h.hexdigest()
+
+def stat_or_none(p: Path) -> os.stat_result | None:
     try:
-        return p.with_stem(stem)
-    except AttributeError:
-        return p.with_name(stem + p.suffix)
+        return os.stat(p)
+    except FileNotFoundError:
+        return None
+
+def unique_path(p: Path, also_taken: Iterable[str] = ()) -> Path:
+    """First free name of the form ``stem_N.suffix`` next to *p*.
 
-def unique_path(p: Path) -> Path:
-    if not p.exists():
+    One directory listing instead of an exists() probe per candidate;
+    *also_taken* adds names that are reserved but not on disk yet.
+    """
+    taken = set(also_taken)
+    try:
+        with os.scandir(p.parent) as it:
+            taken.update(e.name for e in it)
+    except FileNotFoundError:
+        pass
+    if p.name not in taken:
         return p
+    stem, suffix = p.stem, p.suffix
     i = 1
-    while True:
-        cand = _with_stem(p, f"{p.stem}_{i}")
-        if not cand.exists():
-            return cand
+    while f"{stem}_{i}{suffix}" in taken:
         i += 1
+    return p.with_name(f"{stem}_{i}{suffix}")
+
+def walk_files(root: Path) -> Generator[os.DirEntry, None, None]:
+    """Yield every file below *root* as an os.DirEntry.
+
+    scandir hands back the entry type with the batched directory read,
+    so there is no stat per entry and no Path object built for it.
+    Directory symlinks are not followed and unreadable directories are
+    skipped with a warning (rglob skips them silently).
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except PermissionError as e:
+            log.warning(f"Skipping unreadable directory {d}: {e.strerror}")
+            continue
+        with it:
+            for e in it:
+                if e.is_dir(follow_symlinks=False):
+                    stack.append(e.path)
+                elif e.is_file():
+                    yield e
+
+_free_cache: dict[int, int] = {}        # st_dev -> free bytes, less what was written since
+_held: dict[Path, tuple[int, int]] = {} # target -> (st_dev, bytes) reserved for its copy
+_space = threading.Condition()
+_wanted = False                         # a copy is waiting for space to come back
+
+def enough_space(dir_: Path, need: int, dev: int, dst: Path) -> bool:
+    """Reserve *need* bytes on device *dev* for *dst*; False if that would breach SAFETY_FREE.
+
+    statvfs seeds the estimate and is repeated only when it gets close to
+    the limit; bytes still reserved by other copies are taken off either
+    figure.  While such copies are running, or same-device moves wait to
+    be settled, a refusal waits for them instead, since finishing one may
+    give space back.
+    """
+    global _wanted
+    with _space:
+        while True:
+            mine = [n for d, n in _held.values() if d == dev]
+            held = sum(mine)
+            free = _free_cache.get(dev)
+            if free is None or free - held - SAFETY_FREE < need:
+                probe = os.fspath(dir_)
+                while not os.path.exists(probe) and probe != (up := os.path.dirname(probe)):
+                    probe = up
+                s = os.statvfs(probe)
+                free = _free_cache[dev] = s.f_bavail * s.f_frsize
+            if free - held - SAFETY_FREE >= need:
+                _held[dst] = (dev, need)
+                return True
+            if not mine or _stop:
+                return False
+            _wanted = True
+            _space.wait(0.5)
+
+def release_space(dst: Path, src_dev: int | None = None):
+    """Drop *dst*'s reservation; its bytes (or its .part's) are on disk now.
+
+    If *dst* landed on *src_dev*, a same-device move, an empty entry stays
+    until the Settler has unlinked the source: only then is its space back.
+    """
+    with _space:
+        if (res := _held.pop(dst, None)) is not None:
+            dev, n = res
+            _free_cache[dev] -= n
+            if dev == src_dev:
+                _held[dst] = (dev, 0)
+            _space.notify_all()
+
+def space_wanted() -> bool:
+    """True, once, if a copy has been waiting for space since the last call."""
+    global _wanted
+    with _space:
+        wanted, _wanted = _wanted, False
+    return wanted
+
+def read_ahead(f, left: int, depth: int = READ_AHEAD) -> Generator[memoryview, None, None]:
+    """Yield successive chunks of *f*, read by a helper thread ahead of use.
+
+    The reader fills a fixed pool of CHUNK buffers, so reading overlaps
+    the caller's write + hash.  A yielded view is only valid until the
+    next one is requested.  When the expected remainder *left* fits in
+    one chunk there is nothing to overlap: it is read inline into a
+    buffer of about its size, without a thread or the CHUNK pool.
+    """
+    if left <= CHUNK:
+        buf = memoryview(bytearray(min(CHUNK, max(left, 64 << 10))))
+        while n := f.readinto(buf):        # loops only if the file grew
+            yield buf[:n]
+        return
 
-def enough_space(dir_: Path, need: int) -> bool:
-    probe = dir_
-    while not probe.exists() and probe != probe.parent:
-        probe = probe.parent
-    s = os.statvfs(probe)
-    return (s.f_bavail * s.f_frsize) - SAFETY_FREE >= need
-
-def verify(src: Path, dst: Path) -> bool:
-    return (
-        src.stat().st_size == dst.stat().st_size
-        and sha256sum(src) == sha256sum(dst)
-    )
+    free: queue.Queue = queue.Queue()
+    full: queue.Queue = queue.Queue()
+    for _ in range(depth + 1):
+        free.put(memoryview(bytearray(CHUNK)))
+
+    def reader():
+        try:
+            while (buf := free.get()) is not None:
+                n = f.readinto(buf)
+                full.put((buf, n))
+                if not n:
+                    return
+        except BaseException as e:
+            full.put((e, 0))
+
+    t = threading.Thread(target=reader, name="read-ahead", daemon=True)
+    t.start()
+    try:
+        while True:
+            buf, n = full.get()
+            if isinstance(buf, BaseException):
+                raise buf
+            if not n:
+                return
+            yield buf[:n]
+            free.put(buf)
+    finally:
+        free.put(None)
+        t.join()
+
+def hash_prefix(h, f, n: int):
+    """Feed the next *n* bytes of file *f* into hasher *h* (resumed copies)."""
+    buf = memoryview(bytearray(min(CHUNK, n)))
+    while n > 0:
+        got = f.readinto(buf[:min(len(buf), n)])
+        if not got:
+            break
+        h.update(buf[:got])
+        n -= got
+
+FICLONE = 0x40049409                    # linux/fs.h: _IOW(0x94, 9, int)
+
+def reflink(src: Path, tmp: Path) -> bool:
+    """Clone *src* into a fresh *tmp* (btrfs, XFS, ...); True if the FS did it.
+
+    A clone shares the source's extents, so the copy is identical by
+    construction and needs no hash.
+    """
+    if not sys.platform.startswith("linux"):
+        return False
+    with src.open("rb") as fin, tmp.open("wb") as fout:
+        try:
+            fcntl.ioctl(fout.fileno(), FICLONE, fin.fileno())
+        except OSError:
+            return False
+        os.fsync(fout.fileno())
+    return True
+
+_NO_KCOPY = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.ENOTSUP, errno.EOPNOTSUPP}
+# file-to-file sendfile is Linux only; macOS / BSD want a socket (as in shutil)
+_SENDFILE_FILES = sys.platform.startswith("linux")
+
+def copy_in_kernel(src: Path, tmp: Path, done: int, size: int, bar: tqdm) -> int:
+    """Copy src[done:] to *tmp* without passing bytes through Python.
+
+    Uses copy_file_range (reflink / server-side copy where the FS has it),
+    then sendfile on Linux.  Returns the new offset; if neither call is
+    supported the caller finishes the rest with the user-space loop.
+    """
+    use_cfr = hasattr(os, "copy_file_range")
+    if not (use_cfr or _SENDFILE_FILES):
+        return done
+    fin = os.open(src, os.O_RDONLY)
+    try:
+        fout = os.open(tmp, os.O_WRONLY | os.O_CREAT | (0 if done else os.O_TRUNC), 0o666)
+        try:
+            os.lseek(fout, done, os.SEEK_SET)      # sendfile writes at the fd position
+            while done < size:
+                count = min(KCHUNK, size - done)
+                try:
+                    if use_cfr:
+                        n = os.copy_file_range(fin, fout, count, done, done)
+                    else:
+                        n = os.sendfile(fout, fin, done, count)
+                except OSError as e:
+                    if e.errno not in _NO_KCOPY:
+                        raise
+                    if not (use_cfr and _SENDFILE_FILES):
+                        break
+                    use_cfr = False
+                    os.lseek(fout, done, os.SEEK_SET)
+                    continue
+                if not n:
+                    break
+                done += n
+                bar.update(n)
+        finally:
+            os.close(fout)
+    finally:
+        os.close(fin)
+    return done
+
+_XATTR_SKIP = {errno.ENOTSUP, errno.ENODATA, errno.EINVAL, errno.EPERM, errno.EACCES}
 
-def fsync_path(p: Path):
-    fd = os.open(p, os.O_RDONLY | (os.O_DIRECTORY if p.is_dir() else 0))
+def copy_meta(src: Path, st_src: os.stat_result, dst: Path):
+    """What copystat + chown did, applied through one fd on *dst*.
+
+    Mode, times and ownership come from the cached source stat, so the
+    source is not stat'ed again.  Extended attributes are copied where
+    both sides support them, as copystat does.
+    """
+    fd = os.open(dst, os.O_RDONLY)
     try:
-        os.fsync(fd)
+        if hasattr(os, "listxattr"):
+            try:
+                names = os.listxattr(src)
+            except OSError as e:
+                if e.errno not in _XATTR_SKIP:
+                    raise
+                names = []
+            for name in names:
+                try:
+                    os.setxattr(fd, name, os.getxattr(src, name))
+                except OSError as e:
+                    if e.errno not in _XATTR_SKIP | {errno.ENOENT}:
+                        raise
+        if os.geteuid() == 0:              # before chmod: chown clears set-id bits
+            os.chown(fd, st_src.st_uid, st_src.st_gid)
+        os.chmod(fd, stat.S_IMODE(st_src.st_mode))
+        os.utime(fd, ns=(st_src.st_atime_ns, st_src.st_mtime_ns))
     finally:
         os.close(fd)
 
-def fmt_actions(state: str, spin: str) -> str:
-    parts: list[str] = []
-    for phase in ("Copying", "Hashing", "Renaming"):
-        if state == phase.lower():
-            parts.append(f"{phase} {spin}")
-        elif (phase == "Copying"  and state in ("hashing", "renaming", "done")) or \
-             (phase == "Hashing"  and state in ("renaming", "done"))          or \
-             (phase == "Renaming" and state == "done"): parts.append(f"{phase} DONE")
-        else:
-            parts.append(phase)
-    return "Actions:" + LABEL_PAD + "  –  ".join(parts)
+def verify(dst: Path, size: int, digest: str) -> bool:
+    return os.stat(dst).st_size == size and file_hash(dst) == digest
+
+_PHASE_TABLE = {
+    "copying":  ("Copying {s}",  "Hashing",      "Renaming"),
+    "hashing":  ("Copying DONE", "Hashing {s}",  "Renaming"),
+    "renaming": ("Copying DONE", "Hashing DONE", "Renaming {s}"),
+    "done":     ("Copying DONE", "Hashing DONE", "Renaming DONE"),
+}
+# every line the spinner can show, built once: state -> one per SPIN frame
+_ACTIONS = {
+    state: tuple(
+        ("Actions:" + LABEL_PAD + "  –  ".join(parts)).format(s=c) for c in SPIN
+    )
+    for state, parts in _PHASE_TABLE.items()
+}
+
+ACT_DISK_FULL = "Actions:" + LABEL_PAD + "SKIP (disk full)"
+ACT_HASH_FAIL = "Actions:" + LABEL_PAD + "HASH FAIL"
+
+def fmt_actions(state: str, frame: int = 0) -> str:
+    return _ACTIONS[state][frame % len(SPIN)]
+
+class Spinner:
+    """Action line whose spinner is redrawn by a daemon thread.
+
+    Copy and hash loops only switch the phase; they never wait on the UI.
+    """
+    def __init__(self, bar: tqdm, every: float = 0.1):
+        self.bar, self.every = bar, every
+        self.state: str | None = None
+        self._frame = 0
+        self._lock = threading.Lock()
+        self._halt = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="spinner", daemon=True)
+        self._thread.start()
+
+    def set(self, state: str):
+        with self._lock:
+            self.state = state
+            print_desc(self.bar, fmt_actions(state, self._frame))
+
+    def show(self, text: str):
+        """Show a static line; the spinner stays idle until the next set()."""
+        with self._lock:
+            self.state = None
+            print_desc(self.bar, text)
+
+    def _run(self):
+        while not self._halt.wait(self.every):
+            with self._lock:
+                if self.state is not None:
+                    self._frame += 1
+                    print_desc(self.bar, fmt_actions(self.state, self._frame))
+
+    def close(self):
+        self._halt.set()
+        self._thread.join()
+        self.bar.close()
 
 # ─────────── Journal ───────────
 class Journal:
+    MARK_SQL = "INSERT OR REPLACE INTO progress (src, dst, done) VALUES (?,?,?)"
+    DONE_SQL = "SELECT 1 FROM progress WHERE src=? AND done=1"
+
     def __init__(self, db: Path):
-        self.conn = sqlite3.connect(db)
+        # autocommit mode: the only transactions are flush()'s explicit ones
+        self.conn = sqlite3.connect(db, isolation_level=None, cached_statements=256)
         self.conn.execute("PRAGMA busy_timeout=10000")
         try:
             self.conn.execute("PRAGMA journal_mode=WAL")
         except sqlite3.OperationalError:
             pass
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute("PRAGMA cache_size=-32000")    # 32 MB page cache
+        self._rows: list[tuple[str, str, int]] = []
+        self._since = 0.0                 # when the oldest buffered row came in
         self.conn.execute(
             "CREATE TABLE IF NOT EXISTS progress("
             "src TEXT PRIMARY KEY, dst TEXT, done INTEGER DEFAULT 0)"
         )
-        self.conn.commit()
 
     def mark(self, src: Path, dst: Path, done: int):
-        self.conn.execute(
-            "INSERT OR REPLACE INTO progress VALUES (?,?,?)",
-            (str(src), str(dst), done),
-        )
-        self.conn.commit()
-
-    def pending(self, root: Path) -> Generator[Path, None, None]:
-        done = {
-            Path(r[0])
-            for r in self.conn.execute("SELECT src FROM progress WHERE done=1")
-        }
-        for p in root.rglob("*"):          # safe now (no dir deletions inside loop)
-            if p.is_file() and p not in done:
-                yield p
+        # Batched: a mark lost in a crash is harmless, its source is
+        # already unlinked so the next run's walk never yields it again.
+        if not self._rows:
+            self._since = monotonic()
+        self._rows.append((str(src), str(dst), done))
+        if len(self._rows) >= COMMIT_EVERY:
+            self.flush()
+
+    def tick(self):
+        """Commit buffered rows once the oldest is COMMIT_SECS old."""
+        if self._rows and monotonic() - self._since > COMMIT_SECS:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            self.conn.execute("BEGIN")
+            try:
+                self.conn.executemany(self.MARK_SQL, self._rows)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            self._rows.clear()
+
+    def pending(self, root: Path) -> Generator[os.DirEntry, None, None]:
+        # One primary-key probe per file still on disk, instead of loading
+        # every done row ever recorded: memory no longer grows with history.
+        cur = self.conn.cursor()
+        for e in walk_files(root):         # safe now (no dir deletions inside loop)
+            if cur.execute(self.DONE_SQL, (e.path,)).fetchone() is None:
+                yield e
+
     def close(self):
+        self.flush()
         self.conn.close()
 
+class Settler:
+    """Finishes moves in batches: fsync each target dir once, then unlink.
+
+    Copies are fsynced before their rename, and a source is only removed
+    after the directory holding its renamed copy has been fsynced, so
+    batching never leaves a window where neither file survives a power
+    cut.  Moves still unsettled after a crash are finished by the
+    identical-target shortcut on the next run.
+
+    A batch is also settled early when a copy is waiting for space, as
+    the sources of same-device moves only give theirs back once unlinked.
+    """
+    def __init__(self, journal: Journal, every: int = SETTLE_EVERY,
+                 max_bytes: int = SETTLE_BYTES):
+        self.journal, self.every, self.max_bytes = journal, every, max_bytes
+        self._dirs: set[Path] = set()
+        self._moved: list[tuple[Path, Path]] = []
+        self._bytes = 0
+        self._since = 0.0                 # when the oldest unsettled move came in
+        self._fds: dict[Path, int] = {}   # open dir fds, least recently used first
+
+    def add(self, src: Path, dst: Path, size: int):
+        if not self._moved:
+            self._since = monotonic()
+        self._dirs.add(dst.parent)
+        self._moved.append((src, dst))
+        self._bytes += size
+        if (len(self._moved) >= self.every or self._bytes >= self.max_bytes
+                or space_wanted()):
+            self.flush()
+
+    def tick(self):
+        """Settle a batch once its oldest move is COMMIT_SECS old (or space
+        is wanted), and commit its journal rows with it rather than a tick later."""
+        if self._moved and (monotonic() - self._since > COMMIT_SECS or space_wanted()):
+            self.flush()
+            self.journal.flush()
+        else:
+            self.journal.tick()
+
+    def _dir_fd(self, d: Path) -> int:
+        # batches keep hitting the same few directories: reuse their fds
+        fd = self._fds.pop(d, None)
+        if fd is None:
+            if len(self._fds) >= DIR_FDS:
+                os.close(self._fds.pop(next(iter(self._fds))))
+            fd = os.open(d, os.O_RDONLY | os.O_DIRECTORY)
+        self._fds[d] = fd
+        return fd
+
+    def flush(self):
+        for d in self._dirs:
+            os.fsync(self._dir_fd(d))
+        for src, dst in self._moved:
+            src.unlink()
+            release_space(dst)
+            self.journal.mark(src, dst, 1)
+        self._dirs.clear()
+        self._moved.clear()
+        self._bytes = 0
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
+
 # ────────────────  Signals  ────────────────
 _stop = False
 def _sig(*_):
@@ -161,94 +562,160 @@ signal.signal(signal.SIGINT, _sig)
 signal.signal(signal.SIGTERM, _sig)
 
 # ────────────────  Copier  ────────────────
-def copy_one(
-    src: Path,
-    src_root: Path,
-    dst_root: Path,
-    journal: Journal,
-    info: tqdm,
-    bar: tqdm,
-    act: tqdm,
-    idx: int,
-    total: int,
-    to_prune: set[Path]
-):
-    t0 = monotonic()
-
-    rel = src.relative_to(src_root)
-    dst = dst_root / rel
-    if dst.exists() and not verify(src, dst):
-        dst = unique_path(dst)
-
+def transfer(src: Path, st_src: os.stat_result, dst: Path, bar: tqdm, act: Spinner) -> bool:
+    """Copy *src* to *dst* via a resumable .part file; True once renamed."""
+    size = st_src.st_size
     tmp = dst.with_suffix(dst.suffix + TEMP_SFX)
-    size = src.stat().st_size
-    dst.parent.mkdir(parents=True, exist_ok=True)
-
-    if not enough_space(dst.parent, size):
-        print_desc(act, "Actions:" + LABEL_PAD + "SKIP (disk full)")
-        return
-
-    done = tmp.stat().st_size if tmp.exists() else 0
+    # mkdir(exist_ok=True) costs a failed mkdir plus a stat when the dir
+    # exists, which is nearly always; stat first, create only if missing
+    st_dir = stat_or_none(dst.parent)
+    if st_dir is None:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        st_dir = os.stat(dst.parent)
+    dst_dev = st_dir.st_dev
+
+    st_tmp = stat_or_none(tmp)
+    done = st_tmp.st_size if st_tmp else 0
     if done > size:
         tmp.unlink()
         done = 0
 
-    # live block
-    print_desc(
-        info,
-        "Current file:" + LABEL_PAD +
-        shorten(src.name, COLS - len("Current file:" + LABEL_PAD) - 1),
-    )
+    if not enough_space(dst.parent, size - done, dst_dev, dst):
+        act.show(ACT_DISK_FULL)
+        return False
+
     bar.reset(total=size)
     bar.update(done)
-    print_desc(act, fmt_actions("copying", next(SPIN)))
+    act.set("copying")
 
     # ─────────────────── Copy ─────────────────────────────────────
-    last = monotonic()
-    while True:
-        with src.open("rb") as fin, tmp.open("ab" if done else "wb") as fout:
-            fin.seek(done)
-            chunk = fin.read(CHUNK)
-            if not chunk:
-                break
+    # same filesystem: a reflink clone needs neither copy nor hash; else let
+    # the kernel copy, and whatever it copied is hashed from the source below
+    if st_src.st_dev == dst_dev:
+        if not done and reflink(src, tmp):
+            bar.update(size)
+            act.set("renaming")
+            tmp.rename(dst)
+            return True
+        done = copy_in_kernel(src, tmp, done, size, bar)
+
+    with src.open("rb", buffering=0) as fin, tmp.open("ab" if done else "wb") as fout:
+        fadvise(fin.fileno(), "SEQUENTIAL")
+        # source is hashed as it streams through, so it is read only once;
+        # the prefix already in tmp is hashed first, leaving fin at `done`
+        h_src = new_hasher(HASH_ALGO)
+        hash_prefix(h_src, fin, done)
+        for chunk in read_ahead(fin, size - done):
+            n = len(chunk)
             fout.write(chunk)
-            done += len(chunk)
-            bar.update(len(chunk))
-            if monotonic() - last > 0.2:
-                print_desc(act, fmt_actions("copying", next(SPIN)))
-                last = monotonic()
+            h_src.update(chunk)
+            done += n
+            bar.update(n)
+        # source is fully hashed and about to be unlinked
+        fadvise(fin.fileno(), "DONTNEED")
+        # data must be on disk before the rename can make it the target
+        fout.flush()
+        os.fsync(fout.fileno())
 
     if _stop:
-        return
+        return False
 
     # ─────────────────── Hash ─────────────────────────────────────
-    last = monotonic()
-    print_desc(act, fmt_actions("hashing", next(SPIN)))
-    if not verify(src, tmp):
-        print_desc(act, "Actions:" + LABEL_PAD + "HASH FAIL")
-        return
-    while monotonic() - last < 0.6:
-        print_desc(act, fmt_actions("hashing", next(SPIN)))
+    act.set("hashing")
+    # `done` already says whether the source changed size under us; only
+    # a plausible copy is worth reading back
+    if done != size or not verify(tmp, size, h_src.hexdigest()):
+        act.show(ACT_HASH_FAIL)
+        return False
 
     # ─────────────────── Rename ───────────────────────────────────
-    print_desc(act, fmt_actions("renaming", next(SPIN)))
+    act.set("renaming")
     tmp.rename(dst)
-    fsync_path(dst.parent)
-
-    shutil.copystat(src, dst, follow_symlinks=False)
-    st = src.stat()
-    if os.geteuid() == 0:
-        os.chown(dst, st.st_uid, st.st_gid)
-    src.unlink()
-    journal.mark(src, dst, 1)
-
-    # remember dirs for *later* pruning
-    d = src.parent
-    while d != src_root and d != d.parent:
-        to_prune.add(d)
-        d = d.parent
-
-    print_desc(act, fmt_actions("done", ""))
+    return True
+
+class Slot:
+    """One worker's block of live lines: current file, bytes, actions."""
+    def __init__(self, position: int):
+        self.info = tqdm(total=0, bar_format="{desc}", ncols=COLS, position=position, leave=True)
+        self.bar = tqdm(
+            total=1,
+            unit="B",
+            unit_scale=True,
+            bar_format=(
+                "Progress:" + LABEL_PAD +
+                "|{bar}| {percentage:3.0f} %  {n_fmt}/{total_fmt}  {rate_fmt}"
+            ),
+            ncols=BAR_NCOLS,
+            position=position + 1,
+            leave=True,
+        )
+        self.act = Spinner(
+            tqdm(total=0, bar_format="{desc}", ncols=COLS, position=position + 2, leave=True)
+        )
+
+    def close(self):
+        for b in (self.info, self.bar, self.act): b.close()
+
+# targets picked by running workers, so two copies never share a name
+_claimed: set[Path] = set()
+_claim_lock = threading.Lock()
+
+def copy_one(
+    src: Path,
+    st_src: os.stat_result,
+    src_root: Path,
+    dst_root: Path,
+    slot: Slot,
+    idx: int,
+    total: int,
+) -> Path | None:
+    """Place *src* under *dst_root*; return the target once it is in place.
+
+    Runs on a worker thread.  Unlinking the source, the journal and
+    pruning are left to the caller, on the main thread.
+    """
+    t0 = monotonic()
+
+    rel = src.relative_to(src_root)
+    dst = dst_root / rel
+    size = st_src.st_size
+    bar, act = slot.bar, slot.act
+
+    # live block: the name line is built once per file, not per redraw
+    print_desc(slot.info, FILE_LABEL + shorten(src.name, NAME_ROOM))
+
+    # An existing target is compared by size first (one stat) and hashed
+    # only when sizes match.  An identical one is a copy that was already
+    # renamed into place before the run stopped, so only finishing is left.
+    st_dst = stat_or_none(dst)
+    in_place = bool(
+        st_dst and st_dst.st_size == size and file_hash(dst) == file_hash(src)
+    )
+    with _claim_lock:
+        # free at the stat above, but another worker may have renamed its
+        # copy there since (and dropped its claim): look again under the lock
+        if st_dst is None and dst not in _claimed:
+            st_dst = stat_or_none(dst)
+        if dst in _claimed or (st_dst and not in_place):
+            in_place = False
+            dst = unique_path(dst, (c.name for c in _claimed if c.parent == dst.parent))
+        _claimed.add(dst)
+    placed = False
+    try:
+        if in_place:
+            act.set("renaming")
+        elif not transfer(src, st_src, dst, bar, act):
+            return None
+        copy_meta(src, st_src, dst)
+        placed = True
+    finally:
+        with _claim_lock:
+            _claimed.discard(dst)
+        # the copy is over; a same-device move stays on record until the
+        # Settler has unlinked the source
+        release_space(dst, st_src.st_dev if placed else None)
+
+    act.show(fmt_actions("done"))
     bar.refresh()
     tqdm.write(
         f"INFO: OK {idx}/{total}  "
@@ -256,14 +723,26 @@ def copy_one(
         f"Time: {fmt_secs(monotonic()-t0)}  "
         f"FILE: {dst.name}"
     )
+    return dst
 
 # ────────────────  Driver  ────────────────
-def drive(src_root: Path, dst_root: Path, no_source_dir: bool = True):
+def drive(src_root: Path, dst_root: Path, no_source_dir: bool = True, jobs: int = JOBS,
+          algo: str = "sha256"):
+    global HASH_ALGO
+    try:
+        new_hasher(algo)
+    except ImportError as e:
+        sys.exit(f"--hash {algo} needs `pip install {e.name}` (or the fast-hash extra) first.")
+    HASH_ALGO = algo
+
     dst_root_final = dst_root if no_source_dir else dst_root / src_root.name
     dst_root_final.mkdir(parents=True, exist_ok=True)
+    jobs = max(1, jobs)
 
     journal = Journal(Path(DB))
-    total = sum(1 for p in src_root.rglob("*") if p.is_file())
+    # one walk serves both the file count and the work list
+    files = list(journal.pending(src_root))
+    total = len(files)
 
     # Initialize progress bars with separator
     separator = tqdm(total=0, bar_format="─" * COLS, position=0, leave=True)
@@ -275,39 +754,74 @@ def drive(src_root: Path, dst_root: Path, no_source_dir: bool = True):
         position=1,
         leave=True,
     )
-    info_bar = tqdm(total=0, bar_format="{desc}", ncols=COLS, position=2, leave=True)
-    prog_bar = tqdm(
-        total=1,
-        unit="B",
-        unit_scale=True,
-        bar_format=(
-            "Progress:" + LABEL_PAD +
-            "|{bar}| {percentage:3.0f} %  {n_fmt}/{total_fmt}  {rate_fmt}"
-        ),
-        ncols=BAR_NCOLS,
-        position=3,
-        leave=True,
-    )
-    act_bar = tqdm(total=0, bar_format="{desc}", ncols=COLS, position=4, leave=True)
+    slots: queue.Queue[Slot] = queue.Queue()
+    all_slots = [Slot(2 + 3 * i) for i in range(jobs)]
+    for slot in all_slots:
+        slots.put(slot)
 
     dirs_to_prune: set[Path] = set()
+    settle = Settler(journal)
 
-    for src in journal.pending(src_root):
+    def work(idx: int, entry: os.DirEntry):
         if _stop:
-            break
-        copy_one(
-            src,
-            src_root,
-            dst_root_final,
-            journal,
-            info_bar,
-            prog_bar,
-            act_bar,
-            idx=files_bar.n + 1,
-            total=total,
-            to_prune=dirs_to_prune,
-        )
+            return None
+        src = Path(entry.path)
+        # the list was walked up front: a file (or a symlink's target) may
+        # be gone by now, and entry.stat() may be cached from the walk
+        try:
+            st_src = entry.stat()
+            slot = slots.get()
+            try:
+                return src, st_src.st_size, copy_one(
+                    src, st_src, src_root, dst_root_final, slot, idx, total
+                )
+            finally:
+                slots.put(slot)
+        except FileNotFoundError as e:
+            log.warning(f"Skipping vanished file {src}: {e.strerror}")
+            return src, 0, None
+
+    # main thread only: bars, source unlinks, journal (sqlite is per-thread)
+    def finish(fut):
+        res = fut.result()
+        if res is None:             # skipped after a stop signal
+            return
         files_bar.update(1)
+        src, size, dst = res
+        if dst is None:
+            return
+        settle.add(src, dst, size)
+        # remember dirs for *later* pruning
+        d = src.parent
+        while d != src_root and d != d.parent:
+            dirs_to_prune.add(d)
+            d = d.parent
+
+    # wakes a few times a second, so neither a slow file nor a copy waiting
+    # for space holds back settling and committing the ones before it
+    def reap(inflight: set) -> set:
+        finished, inflight = wait(inflight, timeout=0.25, return_when=FIRST_COMPLETED)
+        for f in finished:
+            finish(f)
+        settle.tick()
+        return inflight
+
+    # a bounded window of submitted files keeps _stop responsive
+    try:
+        with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="copy") as ex:
+            inflight: set = set()
+            for idx, entry in enumerate(files, 1):
+                if _stop:
+                    break
+                while len(inflight) >= 2 * jobs:
+                    inflight = reap(inflight)
+                inflight.add(ex.submit(work, idx, entry))
+            while inflight:
+                inflight = reap(inflight)
+    finally:
+        # also on an error: moves already renamed into place get settled
+        settle.close()
+        journal.flush()
 
     # ── remove collected empty dirs (deepest first) ──
     for d in sorted(dirs_to_prune, key=lambda p: len(p.parts), reverse=True):
@@ -322,7 +836,8 @@ def drive(src_root: Path, dst_root: Path, no_source_dir: bool = True):
         pass
 
     # close bars & journal
-    for b in (files_bar, info_bar, prog_bar, act_bar): b.close()
+    files_bar.close()
+    for slot in all_slots: slot.close()
     journal.close()
     log.info("Session finished – re-run to resume.")
 
@@ -333,10 +848,14 @@ def parse() -> argparse.Namespace:
     p.add_argument("destination", type=Path)
     p.add_argument("-s", "--source-dir", action="store_false", dest="with_source_dir",
                   help="Move contents with source directory in destination. /path/to/source/X/ -> /path/to/destination/X/")
+    p.add_argument("-j", "--jobs", type=int, default=JOBS,
+                  help=f"Files copied in parallel (default {JOBS}; use 1 for a single spinning disk)")
+    p.add_argument("--hash", choices=HASHES, default="sha256", dest="algo",
+                  help="Integrity check after copy: sha256 (default) or the faster, non-cryptographic blake3 / xxh3")
     return p.parse_args()
 
 if __name__ == "__main__":
     args = parse()
     if not args.source.is_dir():
         sys.exit(f"Source is not a directory: {args.source}")
-    drive(args.source.resolve(), args.destination.resolve(), args.with_source_dir)
\ No newline at end of file
+    drive(args.source.resolve(), args.destination.resolve(), args.with_source_dir, args.jobs, args.algo)
\ No newline at end of file
@@ -0,0 +1,211 @@
+import hashlib
+import importlib.util
+import os
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+MOVE = Path(__file__).resolve().parents[1] / "move" / "move.py"
+MiB = 1 << 20
+
+
+@pytest.fixture(scope="module")
+def _move_mod(tmp_path_factory):
+    # move.py is a script: it opens its log file in the cwd on import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("log"))
+    try:
+        spec = importlib.util.spec_from_file_location("safe_move", MOVE)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    finally:
+        os.chdir(cwd)
+    return mod
+
+
+@pytest.fixture
+def mv(_move_mod, tmp_path, monkeypatch):
+    """move.py with fresh module state; its journal lands in tmp_path."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(_move_mod, "SAFETY_FREE", 0)
+    monkeypatch.setattr(_move_mod, "_stop", False)
+    _move_mod._free_cache.clear()
+    _move_mod._held.clear()
+    _move_mod._claimed.clear()
+    return _move_mod
+
+
+def write(p: Path, data: bytes) -> Path:
+    p.parent.mkdir(parents=True, exist_ok=True)
+    p.write_bytes(data)
+    return p
+
+
+def digest(p: Path) -> str:
+    return hashlib.sha256(p.read_bytes()).hexdigest()
+
+
+def digests(root: Path) -> list[str]:
+    return sorted(digest(p) for p in root.rglob("*") if p.is_file())
+
+
+def done_rows(db: Path) -> int:
+    with sqlite3.connect(db) as conn:
+        return conn.execute("SELECT count(*) FROM progress WHERE done=1").fetchone()[0]
+
+
+def test_plain_move_removes_source(mv, tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write(src / "a" / "x.bin", os.urandom(3 * MiB))
+    write(src / "a" / "b" / "y.bin", os.urandom(20 * MiB))
+    write(src / "top.txt", b"hello")
+    write(src / "empty", b"")
+    before = digests(src)
+
+    mv.drive(src, dst)
+
+    assert digests(dst) == before
+    assert (dst / "a" / "b" / "y.bin").is_file()
+    assert not src.exists()
+    assert done_rows(tmp_path / mv.DB) == 4
+
+
+def test_vanished_files_are_skipped(mv, tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    for i in range(4):
+        write(src / f"f{i}.bin", os.urandom(MiB))
+    (src / "link").symlink_to("f0.bin")
+    listed = mv.Journal.pending
+
+    def pending(self, root):
+        entries = list(listed(self, root))
+        (src / "f2.bin").unlink()           # gone before its turn
+        (src / "f0.bin").unlink()           # ... and so is the link's target
+        return iter(entries)
+
+    monkeypatch.setattr(mv.Journal, "pending", pending)
+    mv.drive(src, dst, jobs=1)
+
+    assert sorted(p.name for p in dst.iterdir()) == ["f1.bin", "f3.bin"]
+
+
+def test_collisions_get_unique_names_in_parallel(mv, tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    for name in ("x.bin", "x_1.bin", "x_2.bin", "x_3.bin"):
+        write(src / name, os.urandom(MiB))
+    write(dst / "x.bin", b"already here")
+    expected = sorted(digests(src) + digests(dst))
+
+    mv.drive(src, dst, jobs=4)
+
+    assert digests(dst) == expected
+    assert len(list(dst.iterdir())) == 5
+    assert not list(dst.glob("*" + mv.TEMP_SFX))
+
+
+def test_name_taken_after_stat_is_not_overwritten(mv, tmp_path, monkeypatch):
+    # x.bin's copy is renamed to x_1.bin while x_1.bin's worker still
+    # trusts its earlier "no such target" stat
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    write(src / "x.bin", os.urandom(MiB))
+    write(src / "x_1.bin", os.urandom(MiB))
+    write(dst / "x.bin", b"unrelated")
+    expected = sorted(digests(src) + digests(dst))
+    stat_or_none, late = mv.stat_or_none, [dst / "x_1.bin"]
+
+    def slow_stat(p):
+        st = stat_or_none(p)
+        if p in late:
+            late.remove(p)
+            time.sleep(0.5)
+        return st
+
+    monkeypatch.setattr(mv, "stat_or_none", slow_stat)
+    mv.drive(src, dst, jobs=2)
+
+    assert digests(dst) == expected
+
+
+def test_resume_from_part(mv, tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    data = os.urandom(5 * MiB)
+    write(src / "v.mp4", data)
+    write(dst / ("v.mp4" + mv.TEMP_SFX), data[: 2 * MiB])
+
+    mv.drive(src, dst)
+
+    assert (dst / "v.mp4").read_bytes() == data
+    assert not (dst / ("v.mp4" + mv.TEMP_SFX)).exists()
+    assert not src.exists()
+
+
+def test_identical_target_is_finished_in_place(mv, tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    data = os.urandom(MiB)
+    write(src / "v.mp4", data)
+    write(dst / "v.mp4", data)
+
+    mv.drive(src, dst)
+
+    assert [p.name for p in dst.iterdir()] == ["v.mp4"]
+    assert (dst / "v.mp4").read_bytes() == data
+    assert not src.exists()
+
+
+def test_opens_existing_journal(mv, tmp_path):
+    db = tmp_path / "old.db"
+    with sqlite3.connect(db) as conn:
+        conn.execute(
+            "CREATE TABLE progress("
+            "src TEXT PRIMARY KEY, dst TEXT, done INTEGER DEFAULT 0)"
+        )
+        conn.execute("INSERT INTO progress VALUES (?,?,1)",
+                     (str(tmp_path / "src" / "old.bin"), "x"))
+    write(tmp_path / "src" / "old.bin", b"moved before")
+    write(tmp_path / "src" / "new.bin", b"still to do")
+
+    journal = mv.Journal(db)
+    pending = [e.name for e in journal.pending(tmp_path / "src")]
+    journal.mark(tmp_path / "src" / "new.bin", tmp_path / "dst" / "new.bin", 1)
+    journal.close()
+
+    assert pending == ["new.bin"]
+    assert done_rows(db) == 2
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_low_space_same_device(mv, tmp_path, monkeypatch, jobs):
+    # room for two files beyond SAFETY_FREE: each move must give its
+    # source's space back before the next ones can fit
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    for i in range(6):
+        write(src / f"f{i}.bin", os.urandom(8 * MiB))
+    before = digests(src)
+    s = os.statvfs(tmp_path)
+    monkeypatch.setattr(mv, "SAFETY_FREE", s.f_bavail * s.f_frsize - 20 * MiB)
+
+    mv.drive(src, dst, jobs=jobs)
+
+    assert digests(dst) == before
+    assert not src.exists()
+
+
+def test_same_device_moves_are_batched(mv, tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    for i in range(40):
+        write(src / f"f{i}.bin", b"%d" % i)
+    batches = []
+    settle = mv.Settler.flush
+
+    def flush(self):
+        if self._moved:
+            batches.append(len(self._moved))
+        settle(self)
+
+    monkeypatch.setattr(mv.Settler, "flush", flush)
+    mv.drive(src, dst)
+
+    assert sum(batches) == 40
+    assert len(batches) < 40